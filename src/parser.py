@@ -1,5 +1,4 @@
 from typing import Generator, Sequence, cast, Callable as TypingCallable
-from enum import Enum, auto
 from dataclasses import dataclass
 from itertools import groupby, chain as iterchain
 
@@ -16,7 +15,7 @@ from .syntax import (
     PrototypeFunctionLiteral, PrototypeBuiltin, Call,
     Index,
     PrototypeIdentifier, Identifier, TypedIdentifier, ReturnTyped, UnpackTarget, Assign,
-    Int, Bool,
+    Int, Bool, make_int, make_bool,
     Range, IterIn,
     BinOp,
     Less, LessEqual, Greater, GreaterEqual, Equal, MemberIn,
@@ -70,6 +69,15 @@ from .utils import (
 import pdb
 
 
+# when True, unhandled parse paths drop into the debugger before raising.
+# Off by default, since pdb.set_trace() installs a trace hook that slows down everything run afterwards
+DEBUG = False
+
+def _debug_break() -> None:
+    if DEBUG:
+        pdb.set_trace()
+
+
 
 
 
@@ -87,13 +95,20 @@ def parse_generator(tokens: list[Token]) -> Generator[AST, None, None]:
     Parse all tokens into a sequence of ASTs
     """
 
-    while len(tokens) > 0:
-        chain, tokens = get_next_chain(tokens)
+    i, n = 0, len(tokens)
+    while i < n:
+        chain, i = get_next_chain(tokens, i)
         yield parse_chain(chain)
 
 
 def parse(tokens: list[Token]) -> AST:
-    items = [*parse_generator(tokens)]
+    # same loop as parse_generator, but appending directly rather than resuming a generator per expression
+    items: list[AST] = []
+    append = items.append
+    i, n = 0, len(tokens)
+    while i < n:
+        chain, i = get_next_chain(tokens, i)
+        append(parse_chain(chain))
 
     # depending on how many expressions were parsed, return an AST or container
     if len(items) == 0:
@@ -170,14 +185,17 @@ class QJux(AST):
 # TODO: class for compund operators, e.g. += -= .+= .-= not=? not>? etc.
 # TODO: how to handle unary operators in the table? perhaps make PrefixOperator_t/PostfixOperator_t classes?
 # TODO: add specification of associativity for each row
-class Associativity(Enum):
-    left = auto()  # left-to-right
-    right = auto()  # right-to-left
-    unary = auto()  # out-to-in
-    # prefix = auto()
-    # postfix = auto()
-    none = auto()
-    fail = auto()
+# plain int constants rather than an Enum, since these are compared for every split of a chain
+class Associativity:
+    left = 0  # left-to-right
+    right = 1  # right-to-left
+    unary = 2  # out-to-in
+    # prefix = ...
+    # postfix = ...
+    none = 3
+    fail = 4
+
+associativity_names: dict[int, str] = {v: k for k, v in vars(Associativity).items() if not k.startswith('_')}
 
 
 """
@@ -219,7 +237,7 @@ class Associativity(Enum):
 if-else-loop chain expr is more like a single unit, so it doesn't really have a precedence. but they act like they have the lowest precedence since the expressions they capture will be full chains only broken by space/seq
 the unary versions of + - * / % have the same precedence as their binary versions
 """
-operator_groups: list[tuple[Associativity, Sequence[Operator_t]]] = list(reversed([
+operator_groups: list[tuple[int, Sequence[Operator_t]]] = list(reversed([
     (Associativity.unary, [Operator_t('@')]),
     (Associativity.left, [Operator_t('.'), Juxtapose_t(None)]),  # jux-call, jux-index
     (Associativity.none, [TypeParamJuxtapose_t(None)]),
@@ -250,7 +268,7 @@ operator_groups: list[tuple[Associativity, Sequence[Operator_t]]] = list(reverse
     (Associativity.none,  [Operator_t('else')]),
 ]))
 precedence_table: dict[Operator_t, int | qint] = {}
-associativity_table: dict[int, Associativity] = {}
+associativity_table: dict[int, int] = {}
 for i, (assoc, group) in enumerate(operator_groups):
 
     # mark precedence level i as the specified associativity
@@ -272,11 +290,12 @@ for i, (assoc, group) in enumerate(operator_groups):
 def operator_precedence(op: Operator_t|OpChain_t|BroadcastOp_t|CombinedAssignmentOp_t) -> int | qint:
 
     # for complex operators, extract the actual operator that determines precedence
-    if isinstance(op, CombinedAssignmentOp_t):
+    # (identity checks on the class, since none of these token types are subclassed)
+    if op.__class__ is CombinedAssignmentOp_t:
         op = op.assign # combined assignment has same precedence as regular assignment
-    if isinstance(op, BroadcastOp_t):
+    if op.__class__ is BroadcastOp_t:
         op = op.op # precedence should be based on the operator attached to the . operator
-    if isinstance(op, OpChain_t):
+    if op.__class__ is OpChain_t:
         op = op.ops[0] # opchain precedence is determined by the first operator in the chain
 
     try:
@@ -285,7 +304,7 @@ def operator_precedence(op: Operator_t|OpChain_t|BroadcastOp_t|CombinedAssignmen
         raise ValueError(f"ERROR: expected operator, got {op=} which failed to return a value from the operator precedence table") from None
 
 
-def operator_associativity(op: Operator_t | int) -> Associativity|set[Associativity]:
+def operator_associativity(op: Operator_t | int) -> int|set[int]:
     if not isinstance(op, int):
         i = operator_precedence(op)
         # assert isinstance(i, int), f'Cannot determine associativity of operator ({op}) with multiple precedence levels ({i})'
@@ -303,19 +322,27 @@ def operator_associativity(op: Operator_t | int) -> Associativity|set[Associativ
 def parse_chain(chain: Chain[Token]) -> AST:
     assert isinstance(chain, Chain), f"ERROR: parse chain must be called on Chain[Token], got {type(chain)}"
 
-    if len(chain) == 0:
+    # dispatch on the chain length first: empty, single atom, atom-op-atom, or general
+    n = len(chain)
+    if n == 0:
         return void
-    if len(chain) == 1:
+    if n == 1:
         return parse_single(chain[0])
 
-    try:
-        left, op, right = split_by_lowest_precedence(chain)
-    except AmbiguousPrecedenceError as e:
-        pdb.set_trace()
-        ... #TODO: handle ambiguous precedence error by making a QAST
-        return build_quantum_expr(e.ops, e.ranks, e.assocs, e.tokens)
+    # fast path for the common `atom op atom` chain. With no operators at either end, the middle token is the only operator
+    if n == 3 and chain[0].kind == 0 and chain[2].kind == 0:
+        left, op, right = parse_single(chain[0]), chain[1], parse_single(chain[2])
+    else:
+        try:
+            left, op, right = split_by_lowest_precedence(chain)
+        except AmbiguousPrecedenceError as e:
+            _debug_break()
+            #TODO: handle ambiguous precedence error by making a QAST, i.e. build_quantum_expr(e.ops, e.ranks, e.assocs, e.tokens)
+            raise
 
-    left, right = parse_chain(left), parse_chain(right)
+        # sides that are a single atom are parsed directly rather than re-entering parse_chain
+        left = parse_single(left[0]) if len(left) == 1 else parse_chain(left)
+        right = parse_single(right[0]) if len(right) == 1 else parse_chain(right)
 
     assert not (left is void and right is void), f"Internal Error: both left and right returned void during parse chain, implying both left and right side of operator were empty, i.e. chain was invalid: {chain}"
 
@@ -328,7 +355,7 @@ def parse_chain(chain: Chain[Token]) -> AST:
 
 
 class AmbiguousPrecedenceError(ValueError):
-    def __init__(self, ops: list[Operator_t], ranks: list[int], assocs: list[Associativity], tokens: Chain[Token]):
+    def __init__(self, ops: list[Operator_t], ranks: list[int], assocs: list[int], tokens: Chain[Token]):
         self.ops = ops
         self.ranks = ranks
         self.assocs = assocs
@@ -362,8 +389,8 @@ def split_by_lowest_precedence(tokens: Chain[Token]) -> tuple[Chain[Token], Toke
         return unary_split_by_lowest_precedence(tokens, ops, idxs)
 
     # filter out any unary operators
-    assocs, idxs, ops = zip(*[(a, i, op) for a, i, op in zip(assocs, idxs, ops) if a is not Associativity.unary])
-    assocs, idxs, ops = cast(list[Associativity], assocs), cast(list[int], idxs), cast(list[Token], ops)
+    assocs, idxs, ops = zip(*[(a, i, op) for a, i, op in zip(assocs, idxs, ops) if a != Associativity.unary])
+    assocs, idxs, ops = cast(list[int], assocs), cast(list[int], idxs), cast(list[Token], ops)
 
     # continue handling binary operators as before
     ranks = [operator_precedence(op) for op in ops]
@@ -410,7 +437,7 @@ def unary_split_by_lowest_precedence(tokens: Chain[Token], ops: list[Token], idx
     # if both have the same precedence (shouldn't generally happen), probably just do left to right
 
     #TODO: this might actually fail for the jux operators because to determine if they are prefix or postfix requires looking at the left and right token...
-    pdb.set_trace()
+    _debug_break()
 
 
     # get the leftmost and rightmost operators
@@ -441,91 +468,104 @@ def unary_split_by_lowest_precedence(tokens: Chain[Token], ops: list[Token], idx
     return Chain(tokens[:i]), tokens[i], Chain(tokens[i+1:])
 
 
+# how to build an AST from a chain containing a single token, keyed on the token type
+single_parsers: dict[type[Token], TypingCallable[[Token], AST]] = {
+    Undefined_t: lambda token: undefined,
+    Identifier_t: lambda token: PrototypeIdentifier(token.src),
+    Integer_t: lambda token: make_int(int(token.src)),
+    Boolean_t: lambda token: make_bool(bool_to_bool(token.src)),
+    BasedNumber_t: lambda token: make_int(based_number_to_int(token.src)),
+    RawString_t: lambda token: String(token.to_str()),
+    DotDot_t: lambda token: BareRange(void, void),
+    DotDotDot_t: lambda token: DotDotDot(),
+    Backticks_t: lambda token: Backticks(token.src),
+    String_t: lambda token: parse_string(token),
+    Block_t: lambda token: parse_block(token),
+    TypeParam_t: lambda token: parse_type_param(token),
+    Flow_t: lambda token: parse_flow(token),
+    Declare_t: lambda token: parse_declare(token),
+}
+
+
 def parse_single(token: Token) -> AST:
     """Parse a single token into an AST"""
-    match token:
-        case Undefined_t(): return undefined
-        case Identifier_t(): return PrototypeIdentifier(token.src)
-        case Integer_t(): return Int(int(token.src))
-        case Boolean_t(): return Bool(bool_to_bool(token.src))
-        case BasedNumber_t(): return Int(based_number_to_int(token.src))
-        case RawString_t(): return String(token.to_str())
-        case DotDot_t(): return BareRange(void, void)
-        case DotDotDot_t(): return DotDotDot()
-        case Backticks_t(src=src): return Backticks(src)
-        case String_t(): return parse_string(token)
-        case Block_t(): return parse_block(token)
-        case TypeParam_t(): return parse_type_param(token)
-        case Flow_t(): return parse_flow(token)
-        case Declare_t(): return parse_declare(token)
+    if (parser := single_parsers.get(type(token))) is not None:
+        return parser(token)
 
-        case _:
-            # TODO handle other types...
-            pdb.set_trace()
-            ...
-
-    pdb.set_trace()
-    raise NotImplementedError()
+    # TODO handle other types...
+    _debug_break()
     ...
+    raise NotImplementedError(f'parsing single token of type {type(token)} is not implemented')
+
+
+# binary operators that map directly onto an AST constructor, keyed on (token type, operator string)
+binop_builders: dict[tuple[type[Token], str], TypingCallable[[AST, AST], AST]] = {
+    (Operator_t, '|>'): lambda left, right: Call(right, left),
+    (Operator_t, '<|'): Call,
+    (Operator_t, '='): Assign,
+    (Operator_t, '=>'): PrototypeFunctionLiteral,
+    (Operator_t, '->'): PointsTo,
+    (Operator_t, '<->'): BidirPointsTo,
+    (Operator_t, '.'): Access,
+
+    # a bunch of simple cases:
+    (ShiftOperator_t, '<<'): LeftShift,
+    (ShiftOperator_t, '>>'): RightShift,
+    (ShiftOperator_t, '<<<'): LeftRotate,
+    (ShiftOperator_t, '>>>'): RightRotate,
+    (ShiftOperator_t, '<<!'): LeftRotateCarry,
+    (ShiftOperator_t, '!>>'): RightRotateCarry,
+    (Operator_t, '+'): Add,
+    (Operator_t, '-'): Sub,
+    (Operator_t, '*'): Mul,
+    (Operator_t, '/'): Div,
+    (Operator_t, '÷'): IDiv,
+    (Operator_t, '%'): Mod,
+    (Operator_t, '^'): Pow,
+
+    # comparison operators
+    (Operator_t, '=?'): Equal,
+    (Operator_t, '>?'): Greater,
+    (Operator_t, '<?'): Less,
+    (Operator_t, '>=?'): GreaterEqual,
+    (Operator_t, '<=?'): LessEqual,
+    (Operator_t, 'in?'): MemberIn,
+    # (Operator_t, 'is?'): Is,
+    # (Operator_t, 'isnt?'): Isnt,
+    # (Operator_t, '<=>'): ThreewayCompare,
+
+    # Logical Operators. TODO: outtype=Bool is not flexible enough...
+    (Operator_t, 'and'): And,
+    (Operator_t, '&'): And,
+    (Operator_t, 'or'): Or,
+    (Operator_t, '|'): Or,
+    (Operator_t, 'nand'): Nand,
+    (Operator_t, 'nor'): Nor,
+    (Operator_t, 'xor'): Xor,
+    (Operator_t, 'xnor'): Xnor,
+    (Operator_t, ':>'): ReturnTyped,
+}
 
 
 def build_bin_expr(left: AST, op: Token, right: AST) -> AST:
     """create a unary prefix expression AST from the op and right AST"""
 
+    # most operators are a single table lookup. The match below handles the rest
+    op_type = op.__class__
+    if (op_type is Operator_t or op_type is ShiftOperator_t) and (builder := binop_builders.get((op_type, op.op))) is not None:
+        return builder(left, right)
+
     match op:
         #TODO: replace vanilla juxtapose with prototype?
         # when split_by_lowest_precedence is ambiguous we will create a QAST which has all possible ASTs, and disambiguation will happen at runtime/compiletime
         # then we will replace Juxtapose_t here with JuxtaposeCall_t | JuxtaposeIndex_t | JuxtaposeMul_t
         case Juxtapose_t(): return build_quantum_juxtapose(left, right) #return QAST([Call(left, right), Index(left, right), Mul(left, right)])
 
-        case Operator_t(op='|>'): return Call(right, left)
-        case Operator_t(op='<|'): return Call(left, right)
-        case Operator_t(op='='): return Assign(left, right)
-        case Operator_t(op='=>'): return PrototypeFunctionLiteral(left, right)
-        case Operator_t(op='->'): return PointsTo(left, right)
-        case Operator_t(op='<->'): return BidirPointsTo(left, right)
-        case Operator_t(op='.'): return Access(left, right)
-
-        # a bunch of simple cases:
-        case ShiftOperator_t(op='<<'):  return LeftShift(left, right)
-        case ShiftOperator_t(op='>>'):  return RightShift(left, right)
-        case ShiftOperator_t(op='<<<'): return LeftRotate(left, right)
-        case ShiftOperator_t(op='>>>'): return RightRotate(left, right)
-        case ShiftOperator_t(op='<<!'): return LeftRotateCarry(left, right)
-        case ShiftOperator_t(op='!>>'): return RightRotateCarry(left, right)
-        case Operator_t(op='+'): return Add(left, right)
-        case Operator_t(op='-'): return Sub(left, right)
-        case Operator_t(op='*'): return Mul(left, right)
-        case Operator_t(op='/'): return Div(left, right)
-        case Operator_t(op='÷'): return IDiv(left, right)
-        case Operator_t(op='%'): return Mod(left, right)
-        case Operator_t(op='^'): return Pow(left, right)
-
-        # comparison operators
-        case Operator_t(op='=?'): return Equal(left, right)
-        case Operator_t(op='>?'): return Greater(left, right)
-        case Operator_t(op='<?'): return Less(left, right)
-        case Operator_t(op='>=?'): return GreaterEqual(left, right)
-        case Operator_t(op='<=?'): return LessEqual(left, right)
-        case Operator_t(op='in?'): return MemberIn(left, right)
-        # case Operator_t(op='is?'): return Is(left, right)
-        # case Operator_t(op='isnt?'): return Isnt(left, right)
-        # case Operator_t(op='<=>'): return ThreewayCompare(left, right)
-
-        # Logical Operators. TODO: outtype=Bool is not flexible enough...
-        case Operator_t(op='and'|'&'): return And(left, right)
-        case Operator_t(op='or'|'|'): return Or(left, right)
-        case Operator_t(op='nand'): return Nand(left, right)
-        case Operator_t(op='nor'): return Nor(left, right)
-        case Operator_t(op='xor'): return Xor(left, right)
-        case Operator_t(op='xnor'): return Xnor(left, right)
-
         # Misc Operators
         case Operator_t(op=':'):
             if isinstance(left, PrototypeIdentifier): return TypedIdentifier(Identifier(left.name), right)
             #TBD if there are other things that can have type annotations beyond identifiers
             raise ValueError(f'ERROR: can only apply a type to an identifier. Got {left=}, {right=}')
-        case Operator_t(op=':>'): return ReturnTyped(left, right)
 
         case TypeParamJuxtapose_t():
             if isinstance(left, TypeParam):
@@ -610,7 +650,7 @@ def build_bin_expr(left: AST, op: Token, right: AST) -> AST:
             return BroadcastOp(expr)
 
         case _:
-            pdb.set_trace()
+            _debug_break()
             raise NotImplementedError(f'Parsing of operator {op} has not been implemented yet')
 
 _non_callables = (Int, Bool, String, IString, Array, Range, Dict, BidirDict, ObjectLiteral, Void, DotDotDot, BareRange, Backticks)
@@ -682,9 +722,10 @@ def parse_string(token: String_t) -> String | IString:
             if isinstance(ast, Block):
                 parts.append(ast)
             elif isinstance(ast, ListOfASTs):
-                pdb.set_trace()
+                _debug_break()
                 # not sure if this should ever come up, might be a parse bug
                 # or might just need to convert to a block...
+                raise NotImplementedError(f'string interpolation block parsed to multiple expressions: {ast}')
             else:
                 parts.append(Block([ast]))
 
@@ -727,61 +768,72 @@ def as_object_inners(items:list[AST]) -> list[AST] | None:
         return None
     return items
 
+def build_bracket_container(inner: ListOfASTs) -> AST:
+    """Determine which container a square bracket block with multiple expressions represents"""
+    if (asts:=as_dict_inners(inner.asts)) is not None:
+        return Dict(asts)
+    elif (asts:=as_bidir_dict_inners(inner.asts)) is not None:
+        return BidirDict(asts)
+    elif (asts:=as_array_inners(inner.asts)) is not None:
+        return Array(asts)
+    elif (asts:=as_object_inners(inner.asts)) is not None:
+        return ObjectLiteral(inner.asts)
+    # elif (asts:=as_array_generator_inners(inner.asts)) is not None:
+    #     return ArrayGenerator(asts)
+    # elif (asts:=as_dict_generator_inners(inner.asts)) is not None:
+    #     return DictGenerator(asts)
+    # elif (asts:=as_bidict_generator_inners(inner.asts)) is not None:
+    #     return BidirDictGenerator(asts)
+    #error cases
+    if any(isinstance(i, PointsTo) for i in inner.asts) and not all(isinstance(i, PointsTo) for i in inner.asts):
+        raise ValueError(f"ERROR: cannot mix PointsTo with other types in a dict: {inner=}")
+    #TBD other known cases
+    #otherwise there is an issue with the parser
+    raise ValueError(f"INTERNAL ERROR: could not determine container type for {inner=}. Should have been suitably disambiguated by parser...")
+
+
+# how to build a block AST, keyed on (delimiters, type of the parsed inner AST)
+block_builders: dict[tuple[str, type[AST]], TypingCallable[[AST, str], AST]] = {
+    ('()', Void): lambda inner, delims: inner,
+    ('{}', Void): lambda inner, delims: inner,
+    ('[]', Void): lambda inner, delims: inner,
+    ('()', ListOfASTs): lambda inner, delims: Group(inner.asts),
+    ('{}', ListOfASTs): lambda inner, delims: Block(inner.asts),
+    ('[]', ListOfASTs): lambda inner, delims: build_bracket_container(inner),
+    **{(delims, BareRange): (lambda inner, delims: Range(inner.left, inner.right, delims)) for delims in ('()', '[]', '(]', '[)')},
+    ('[]', PointsTo): lambda inner, delims: Dict([inner]),
+    ('[]', BidirPointsTo): lambda inner, delims: BidirDict([inner]),
+    ('[]', Assign): lambda inner, delims: ObjectLiteral([inner]),
+    ('[]', Declare): lambda inner, delims: ObjectLiteral([inner]),
+}
+
+# catch all cases for any type of AST inside a block, keyed on delimiters
+block_default_builders: dict[str, TypingCallable[[AST], AST]] = {
+    '()': lambda inner: Group([inner]),
+    '{}': lambda inner: Block([inner]),
+    # TODO: handle if this should be an object or dictionary instead of an array
+    '[]': lambda inner: Array([inner]),
+}
+
+
 def parse_block(block: Block_t) -> AST:
     """Convert a block token to an AST"""
-
     # parse the inside of the block
     inner = parse(block.body)
 
     delims = block.left + block.right
-    match delims, inner:
-        case '()' | '{}' | '[]', Void():
-            return inner
-        case '()', ListOfASTs():
-            return Group(inner.asts)
-        case '{}', ListOfASTs():
-            return Block(inner.asts)
-        case '[]', ListOfASTs():
-            if (asts:=as_dict_inners(inner.asts)) is not None:
-                return Dict(asts)
-            elif (asts:=as_bidir_dict_inners(inner.asts)) is not None:
-                return BidirDict(asts)
-            elif (asts:=as_array_inners(inner.asts)) is not None:
-                return Array(asts)
-            elif (asts:=as_object_inners(inner.asts)) is not None:
-                return ObjectLiteral(inner.asts)
-            # elif (asts:=as_array_generator_inners(inner.asts)) is not None:
-            #     return ArrayGenerator(asts)
-            # elif (asts:=as_dict_generator_inners(inner.asts)) is not None:
-            #     return DictGenerator(asts)
-            # elif (asts:=as_bidict_generator_inners(inner.asts)) is not None:
-            #     return BidirDictGenerator(asts)
-            #error cases
-            if any(isinstance(i, PointsTo) for i in inner.asts) and not all(isinstance(i, PointsTo) for i in inner.asts):
-                raise ValueError(f"ERROR: cannot mix PointsTo with other types in a dict: {inner=}")
-            #TBD other known cases
-            #otherwise there is an issue with the parser
-            raise ValueError(f"INTERNAL ERROR: could not determine container type for {inner=}. Should have been suitably disambiguated by parser...")
-        case '()' | '[]' | '(]' | '[)', BareRange():
-            return Range(inner.left, inner.right, delims)
-
-        # catch all cases for any type of AST inside a block or range
-        case '()', _:
-            return Group([inner])
-        case '{}', _:
-            return Block([inner])
-        case '[]', PointsTo():
-            return Dict([inner])
-        case '[]', BidirPointsTo():
-            return BidirDict([inner])
-        case '[]', Assign() | Declare():
-            return ObjectLiteral([inner])
-        case '[]', _:
-            # TODO: handle if this should be an object or dictionary instead of an array
-            return Array([inner])
-        case _:
-            pdb.set_trace()
-            raise NotImplementedError(f'block parse not implemented for {block.left+block.right}, {type(inner)}')
+    if (builder := block_builders.get((delims, type(inner)))) is not None:
+        ast = builder(inner, delims)
+    elif (default_builder := block_default_builders.get(delims)) is not None:
+        ast = default_builder(inner)
+    else:
+        ast = None
+
+    if ast is not None:
+        return ast
+
+    _debug_break()
+    raise NotImplementedError(f'block parse not implemented for {block.left+block.right}, {type(inner)}')
 
 
 
@@ -792,6 +844,12 @@ def parse_type_param(param: TypeParam_t) -> TypeParam:
     return TypeParam([items])
 
 
+# how to build a flow AST from its condition and clause, keyed on the flow keyword
+flow_builders: dict[str, TypingCallable[[AST, AST], Flowable]] = {
+    'if': If,
+    'loop': Loop,
+}
+
 def parse_flow(flow: Flow_t) -> Flowable:
 
     # special case for closing else clause in a flow chain. Treat as `<if> <true> <clause>`
@@ -802,29 +860,29 @@ def parse_flow(flow: Flow_t) -> Flowable:
     cond = parse_chain(flow.condition)
     clause = parse_chain(flow.clause)
 
-    match flow.keyword:
-        case Keyword_t(src='if'): return If(cond, clause)
-        case Keyword_t(src='loop'): return Loop(cond, clause)
-        case _:
-            pdb.set_trace()
-            ...
-            raise NotImplementedError('TODO: other flow keywords, namely lazy')
-    pdb.set_trace()
-    ...
+    if (builder := flow_builders.get(flow.keyword.src)) is not None:
+        return builder(cond, clause)
 
+    _debug_break()
+    raise NotImplementedError('TODO: other flow keywords, namely lazy')
+
+
+# declaration type for each declare keyword
+declaration_types: dict[str, DeclarationType] = {
+    'let': DeclarationType.LET,
+    'const': DeclarationType.CONST,
+    # 'local_const': DeclarationType.LOCAL_CONST,
+    # 'fixed_type': DeclarationType.FIXED_TYPE,
+}
 
 def parse_declare(declare: Declare_t) -> Declare:
     expr = parse_chain(declare.expr)
     assert isinstance(expr, (PrototypeIdentifier, Identifier, TypedIdentifier, ReturnTyped, UnpackTarget, Assign)), f'ERROR: expected identifier, typed-identifier, or unpack target for declare expression, got {expr=}'
-    match declare:
-        case Declare_t(keyword=Keyword_t(src='let')): return Declare(DeclarationType.LET, expr)
-        case Declare_t(keyword=Keyword_t(src='const')): return Declare(DeclarationType.CONST, expr)
-        # case Declare_t(keyword=Keyword_t(src='local_const')): return Declare(DeclarationType.LOCAL_CONST, expr)
-        # case Declare_t(keyword=Keyword_t(src='fixed_type')): return Declare(DeclarationType.FIXED_TYPE, expr)
-        case _:
-            raise ValueError(f"ERROR: unknown declare keyword {declare.keyword=}. Expected one of {DeclarationType.__members__}. {declare=}")
-    pdb.set_trace()
-    raise NotImplementedError
+
+    if (decltype := declaration_types.get(declare.keyword.src)) is not None:
+        return Declare(decltype, expr)
+
+    raise ValueError(f"ERROR: unknown declare keyword {declare.keyword=}. Expected one of {DeclarationType.__members__}. {declare=}")
 
 
 
@@ -892,9 +950,9 @@ def get_precedence_table_markdown() -> str:
     def get_opnames_str(ops: list[Operator_t | ShiftOperator_t | Juxtapose_t | Comma_t]) -> str:
         return '<br>'.join(f'{opname_map.get(op.op, None) if isinstance(op, (Operator_t, ShiftOperator_t)) else op.__class__.__name__[:-2].lower()}' for op in ops)
 
-    def get_row_str(row: tuple[Associativity, list[Operator_t | ShiftOperator_t | Juxtapose_t | Comma_t]]) -> str:
+    def get_row_str(row: tuple[int, list[Operator_t | ShiftOperator_t | Juxtapose_t | Comma_t]]) -> str:
         assoc, group = row
-        return f'{get_ops_str(group)} | {get_opnames_str(group)} | {assoc.name}'
+        return f'{get_ops_str(group)} | {get_opnames_str(group)} | {associativity_names[assoc]}'
 
     rows = [
         f'| {i} | {get_row_str(row)} |'
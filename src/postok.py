@@ -1,9 +1,6 @@
 from .tokenizer import (
     tokenize, tprint, full_traverse_tokens,
-    unary_prefix_operators,
-    unary_postfix_operators,
-    binary_operators,
-    opchain_starters,
+    UNARY_PREFIX_OP, UNARY_POSTFIX_OP, BINARY_OP, OPCHAIN_STARTER_OP,
     Token,
     Keyword_t, Undefined_t, Void_t, End_t, New_t,
     WhiteSpace_t, Escape_t,
@@ -38,6 +35,8 @@ class Chain(list[T]):
 ############### NEW TOKENS CREATED BY POST-TOKENIZATION PROCESS ###############
 
 class Flow_t(Token):
+    __slots__ = ('keyword', 'condition', 'clause')
+
     @overload
     def __init__(self, keyword: None, condition: None, clause: Chain[Token]): ...  # closing else
     @overload
@@ -65,6 +64,8 @@ class Flow_t(Token):
 
 
 class Declare_t(Token):
+    __slots__ = ('keyword', 'expr')
+
     def __init__(self, keyword: Keyword_t, expr: Chain[Token]):
         self.keyword = keyword
         self.expr = expr
@@ -80,6 +81,7 @@ class Declare_t(Token):
 class RangeJuxtapose_t(Operator_t):
     def __init__(self, _):
         super().__init__('')
+        self.kind = BINARY_OP
 
     def __repr__(self) -> str:
         return "<RangeJuxtapose_t>"
@@ -94,6 +96,7 @@ class RangeJuxtapose_t(Operator_t):
 class EllipsisJuxtapose_t(Operator_t):
     def __init__(self, _):
         super().__init__('')
+        self.kind = BINARY_OP
 
     def __repr__(self) -> str:
         return "<EllipsisJuxtapose_t>"
@@ -108,6 +111,7 @@ class EllipsisJuxtapose_t(Operator_t):
 class BackticksJuxtapose_t(Operator_t):
     def __init__(self, _):
         super().__init__('')
+        self.kind = BINARY_OP
 
     def __repr__(self) -> str:
         return "<BackticksJuxtapose_t>"
@@ -122,6 +126,7 @@ class BackticksJuxtapose_t(Operator_t):
 class TypeParamJuxtapose_t(Operator_t):
     def __init__(self, _):
         super().__init__('')
+        self.kind = BINARY_OP
 
     def __repr__(self) -> str:
         return "<TypeParamJuxtapose_t>"
@@ -133,9 +138,13 @@ class TypeParamJuxtapose_t(Operator_t):
         return isinstance(other, TypeParamJuxtapose_t)
 
 class OpChain_t(Token):
+    __slots__ = ('ops', 'kind')
+
     def __init__(self, ops:list[Operator_t]):
         assert len(ops) > 1, f"OpChain_t must have at least 2 operators. Got {len(ops)} operators"
         self.ops = ops
+        # an opchain is a binary operator, and can be a prefix operator if its first operator can be
+        self.kind = BINARY_OP | ops[0].kind & UNARY_PREFIX_OP
 
     def __repr__(self) -> str:
         return f"<OpChain_t: {''.join(op.op for op in self.ops)}>"
@@ -150,6 +159,9 @@ class OpChain_t(Token):
         yield cast(list[Token], self.ops)
 
 class BroadcastOp_t(Token):
+    __slots__ = ('dot', 'op')
+    kind = BINARY_OP
+
     def __init__(self, dot:Operator_t, op:Operator_t|OpChain_t):
         assert isinstance(dot, Operator_t) and dot.op == '.', f"VectorizedOp_t must have a '.' operator. Got {dot}"
         self.dot = dot
@@ -170,6 +182,9 @@ class BroadcastOp_t(Token):
 
 
 class CombinedAssignmentOp_t(Token):
+    __slots__ = ('op', 'assign')
+    kind = BINARY_OP
+
     def __init__(self, op:Operator_t|OpChain_t|BroadcastOp_t, assign:Operator_t):
         assert isinstance(assign, Operator_t) and assign.op == '=', f"CombinedAssignmentOp_t must have an '=' operator. Got {assign}"
         self.op = op
@@ -189,7 +204,11 @@ class CombinedAssignmentOp_t(Token):
         yield [self.assign]
 
 
-atom_tokens = (
+# the following are sets of exact token types (none are subclassed), checked with `type(token) in ...`
+# which is cheaper than isinstance against a tuple
+
+# tokens that can be the atom of a chunk
+atom_tokens = frozenset({
     Identifier_t,
     Integer_t,
     Boolean_t,
@@ -204,20 +223,31 @@ atom_tokens = (
     Backticks_t,
     Flow_t,
     Undefined_t,
-)
+})
 
 # atoms that can be juxtaposed (so juxtaposes next to them shouldn't be removed)
-jux_atoms = (
+jux_atoms = frozenset({
     DotDot_t,
     DotDotDot_t,
     Backticks_t,
-)
+})
 
-non_jux_ops = (
+# invert_whitespace only sees raw tokens, so Operator_t here never matches the juxtapose subclasses
+non_jux_ops = frozenset({
     Operator_t,
     ShiftOperator_t,
     Comma_t
-)
+})
+
+# tokens whose bodies contain their own token streams
+block_tokens = frozenset({Block_t, TypeParam_t})
+
+# juxtapose singleton tokens, shared by every stream so we aren't wasting memory
+jux = Juxtapose_t(None)
+range_jux = RangeJuxtapose_t(None)
+ellipsis_jux = EllipsisJuxtapose_t(None)
+backticks_jux = BackticksJuxtapose_t(None)
+type_param_jux = TypeParamJuxtapose_t(None)
 
 
 
@@ -262,87 +292,94 @@ def invert_whitespace(tokens: list[Token]) -> None:
         tokens (list[Token]): list of tokens to modify. This is modified in place.
     """
 
-    # juxtapose singleton token so we aren't wasting memory
-    jux = Juxtapose_t(None)
+    # bind the module-level types/tables used per token to locals (LOAD_FAST rather than LOAD_GLOBAL)
+    whitespace_t, string_t, blocks, non_jux, jux_ok, jux_token = WhiteSpace_t, String_t, block_tokens, non_jux_ops, jux_atoms, jux
+
+    # token lists still to be processed. Nested blocks are pushed here rather than handled recursively
+    stack = [tokens]
+    while stack:
+        stream = stack.pop()
+
+        # build the new list in a single pass rather than popping/inserting in place (which is O(n²))
+        out: list[Token] = []
+        append = out.append
+        after_whitespace = False
+        left_type = None  # class of the last token kept, so it isn't looked up again from out[-1]
+        for token in stream:
+            # drop whitespace, but remember it so no juxtapose is inserted across it
+            token_type = token.__class__
+            if token_type is whitespace_t:
+                after_whitespace = True
+                continue
 
-    i = 0
-    while i < len(tokens):
-        # delete whitespace if it comes up
-        if isinstance(tokens[i], WhiteSpace_t):
-            tokens.pop(i)
-            continue
+            # queue up inverting whitespace for blocks
+            if token_type in blocks:
+                stack.append(token.body)
+            elif token_type is string_t:
+                for i in token.block_indices:
+                    stack.append(token.body[i].body)
 
-        # recursively handle inverting whitespace for blocks
-        if isinstance(tokens[i], (Block_t, TypeParam_t)):
-            invert_whitespace(tokens[i].body)
-        elif isinstance(tokens[i], String_t):
-            for child in tokens[i].body:
-                if isinstance(child, Block_t):
-                    invert_whitespace(child.body)
-
-        # insert juxtapose if no whitespace between tokens
-        if i + 1 < len(tokens) and not isinstance(tokens[i + 1], WhiteSpace_t):
-            tokens.insert(i + 1, jux)
-            i += 1
-        i += 1
+            # insert juxtapose if no whitespace between tokens,
+            # except next to operators that are not whitespace sensitive
+            #TODO: somewhere around here, need to fix how @ isn't juxtaposable but should be on the left depending on lots of stuff...
+            if left_type is not None and not after_whitespace:
+                if not ((left_type in non_jux or token_type in non_jux)
+                        and left_type not in jux_ok and token_type not in jux_ok):
+                    append(jux_token)
 
-    # finally, remove juxtapose tokens next to operators that are not whitespace sensitive
-    i = 1
-    while i < len(tokens) - 1:
-        left, middle, right = tokens[i-1:i+2]
-        #TODO: somewhere around here, need to fix how @ isn't juxtaposable but should be on the left depending on lots of stuff...
-        if isinstance(middle, Juxtapose_t) \
-        and (isinstance(left, non_jux_ops) or isinstance(right, non_jux_ops))\
-        and not isinstance(left, jux_atoms) and not isinstance(right, jux_atoms):
-            tokens.pop(i)
-            continue
-        i += 1
+            append(token)
+            left_type = token_type
+            after_whitespace = False
 
+        stream[:] = out
 
-def _get_next_prefixes(tokens: list[Token]) -> tuple[list[Token], list[Token]]:
-    prefixes = []
-    while len(tokens) > 0 and is_unary_prefix_op(tokens[0]):
-        prefixes.append(tokens.pop(0))
 
-    return prefixes, tokens
+# the scanning loops below inline is_unary_prefix_op/is_unary_postfix_op with the flag bound to a local,
+# since they run for every token in every chain
 
+def _get_next_prefixes(tokens: list[Token], i: int) -> tuple[list[Token], int]:
+    start, n, flag = i, len(tokens), UNARY_PREFIX_OP
+    while i < n and tokens[i].kind & flag:
+        i += 1
 
-def _get_next_postfixes(tokens: list[Token]) -> tuple[list[Token], list[Token]]:
-    postfixes = []
-    while len(tokens) > 0 and is_unary_postfix_op(tokens[0], exclude_semicolon=True):
-        postfixes.append(tokens.pop(0))
+    return tokens[start:i], i
 
-    return postfixes, tokens
 
+def _get_next_postfixes(tokens: list[Token], i: int) -> tuple[list[Token], int]:
+    start, n, flag = i, len(tokens), UNARY_POSTFIX_OP
+    while i < n and (token := tokens[i]).kind & flag and token.op != ';':
+        i += 1
 
-def _get_next_atom(tokens: list[Token]) -> tuple[Token, list[Token]]:
-    if len(tokens) == 0:
-        raise ValueError(f"ERROR: expected atom, got {tokens=}")
+    return tokens[start:i], i
+
+
+def _get_next_atom(tokens: list[Token], i: int) -> tuple[Token, int]:
+    if i >= len(tokens):
+        raise ValueError(f"ERROR: expected atom, got {tokens[i:]=}")
 
     # TODO: this is going to be unnecessary as expressions will have been bundled up into single tokens
-    if isinstance(tokens[0], Keyword_t):
-        return _get_next_keyword_expr(tokens)
+    token_type = tokens[i].__class__
+    if token_type is Keyword_t:
+        return _get_next_keyword_expr(tokens, i)
 
-    if isinstance(tokens[0], atom_tokens):
-        return tokens[0], tokens[1:]
+    if token_type in atom_tokens:
+        return tokens[i], i + 1
 
-    raise ValueError(f"ERROR: expected atom, got {tokens[0]=}")
+    raise ValueError(f"ERROR: expected atom, got {tokens[i]=}")
 
 
-def _get_next_chunk(tokens: list[Token]) -> tuple[list[Token], list[Token]]:
-    chunk = []
-    t, tokens = _get_next_prefixes(tokens)
-    chunk.extend(t)
+def _get_next_chunk(tokens: list[Token], i: int) -> tuple[list[Token], int]:
+    chunk, i = _get_next_prefixes(tokens, i)
 
-    t, tokens = _get_next_atom(tokens)
+    t, i = _get_next_atom(tokens, i)
     if t is None:
-        raise ValueError(f"ERROR: expected atom, got {tokens[0]=}")
+        raise ValueError(f"ERROR: expected atom, got {tokens[i]=}")
     chunk.append(t)
 
-    t, tokens = _get_next_postfixes(tokens)
+    t, i = _get_next_postfixes(tokens, i)
     chunk.extend(t)
 
-    return chunk, tokens
+    return chunk, i
 
 
 def is_unary_prefix_op(token: Token) -> bool:
@@ -350,8 +387,7 @@ def is_unary_prefix_op(token: Token) -> bool:
     Determines if a token could be a unary prefix operator.
     Note that this is not mutually exclusive with being a postfix operator or a binary operator.
     """
-    return isinstance(token, Operator_t) and token.op in unary_prefix_operators \
-        or isinstance(token, OpChain_t) and token.ops[0].op in unary_prefix_operators
+    return token.kind & UNARY_PREFIX_OP != 0
 
 
 def is_unary_postfix_op(token: Token, exclude_semicolon: bool = False) -> bool:
@@ -361,8 +397,8 @@ def is_unary_postfix_op(token: Token, exclude_semicolon: bool = False) -> bool:
     Note that this is not mutually exclusive with being a prefix operator or a binary operator.
     """
     if exclude_semicolon:
-        return isinstance(token, Operator_t) and token.op in unary_postfix_operators - {';'}
-    return isinstance(token, Operator_t) and token.op in unary_postfix_operators
+        return token.kind & UNARY_POSTFIX_OP != 0 and token.op != ';'
+    return token.kind & UNARY_POSTFIX_OP != 0
 
 
 def is_binop(token: Token) -> bool:
@@ -370,36 +406,37 @@ def is_binop(token: Token) -> bool:
     Determines if a token could be a binary operator.
     Note that this is not mutually exclusive with being a prefix operator or a postfix operator.
     """
-    return isinstance(token, Operator_t) and token.op in binary_operators or isinstance(token, (ShiftOperator_t, Comma_t, Juxtapose_t, RangeJuxtapose_t, EllipsisJuxtapose_t, BackticksJuxtapose_t, TypeParamJuxtapose_t, OpChain_t, BroadcastOp_t, CombinedAssignmentOp_t))
+    return token.kind & BINARY_OP != 0
 
 
 def is_op(token: Token) -> bool:
-    return is_binop(token) or is_unary_prefix_op(token) or is_unary_postfix_op(token)
+    # equivalent to is_binop(token) or is_unary_prefix_op(token) or is_unary_postfix_op(token), as a single mask test
+    return token.kind & (BINARY_OP | UNARY_PREFIX_OP | UNARY_POSTFIX_OP) != 0
 
 
 def is_opchain_starter(token: Token) -> bool:
-    return isinstance(token, Operator_t) and token.op in opchain_starters
+    return token.kind & OPCHAIN_STARTER_OP != 0
 
 
-def _get_next_keyword_expr(tokens: list[Token]) -> tuple[Token, list[Token]]:
-    """package up the next keyword expression into a single token"""
-    if len(tokens) == 0:
-        raise ValueError(f"ERROR: expected keyword expression, got {tokens=}")
-    t, tokens = tokens[0], tokens[1:]
+def _get_next_keyword_expr(tokens: list[Token], i: int) -> tuple[Token, int]:
+    """package up the next keyword expression (starting at index i) into a single token"""
+    if i >= len(tokens):
+        raise ValueError(f"ERROR: expected keyword expression, got {tokens[i:]=}")
+    t, i = tokens[i], i + 1
 
     if not isinstance(t, Keyword_t):
         raise ValueError(f"ERROR: expected keyword expression, got {t=}")
 
     match t:
         case Keyword_t(src='if' | 'loop' | 'lazy'):
-            cond, tokens = get_next_chain(tokens)
-            clause, tokens = get_next_chain(tokens, tracker=ShouldBreakFlowTracker())
-            return Flow_t(t, cond, clause), tokens
+            cond, i = get_next_chain(tokens, i)
+            clause, i = get_next_chain(tokens, i, tracker=ShouldBreakFlowTracker())
+            return Flow_t(t, cond, clause), i
         case Keyword_t(src='closing_else'):
-            clause, tokens = get_next_chain(tokens, tracker=ShouldBreakFlowTracker())
-            return Flow_t(None, None, clause), tokens
+            clause, i = get_next_chain(tokens, i, tracker=ShouldBreakFlowTracker())
+            return Flow_t(None, None, clause), i
         case Keyword_t(src='do'):
-            clause, tokens = get_next_chain(tokens)
+            clause, i = get_next_chain(tokens, i)
             # assert next token is a do_keyward
             # depending on the keyward, get a condition, or condition+clause
             pdb.set_trace()
@@ -412,8 +449,8 @@ def _get_next_keyword_expr(tokens: list[Token]) -> tuple[Token, list[Token]]:
             pdb.set_trace()
             ...
         case Keyword_t(src='let' | 'const' | 'local_const' | 'fixed_type'):
-            expr, tokens = get_next_chain(tokens)
-            return Declare_t(t, expr), tokens
+            expr, i = get_next_chain(tokens, i)
+            return Declare_t(t, expr), i
 
 
     raise NotImplementedError("TODO: handle keyword based expressions")
@@ -423,7 +460,7 @@ def _get_next_keyword_expr(tokens: list[Token]) -> tuple[Token, list[Token]]:
     # (let | const) #chain
 
 
-def get_next_chain(tokens: list[Token], *, tracker: ShouldBreakTracker = None, op_blacklist: set[Token] = None) -> tuple[Chain[Token], list[Token]]:
+def get_next_chain(tokens: list[Token], start: int = 0, *, tracker: ShouldBreakTracker = None, op_blacklist: set[Token] = None) -> tuple[Chain[Token], int]:
     """
     grab the next single expression chain of tokens from the given list of tokens
 
@@ -434,38 +471,45 @@ def get_next_chain(tokens: list[Token], *, tracker: ShouldBreakTracker = None, o
         #chain = #chunk (#binary_op #chunk)* ';'?
 
     Args:
-        tokens (list[Token]): list of tokens to grab the next chain from
+        tokens (list[Token]): list of tokens to grab the next chain from. This is not modified.
+        start (int, optional): index in tokens to start the chain at. Defaults to 0.
         tracker (ShouldBreakTracker, optional): tracker for complex analysis to determine if an operator should break the chain. Defaults to None.
         op_blacklist (set[Token], optional): simpler handler for operators that should break the chain. Defaults to None.
 
     Returns:
-        next, rest (list[Token], list[Token]): the next chain of tokens, and the remaining tokens
+        next, end (list[Token], int): the next chain of tokens, and the index in tokens just after the chain
     """
 
-    if op_blacklist is None:
-        op_blacklist = set()
-
     chain = []
+    append, extend = chain.append, chain.extend
+    n, binop_flag = len(tokens), BINARY_OP
 
     # grab the first chunk and let the tracker view it
-    chunk, tokens = _get_next_chunk(tokens)
-    chain.extend(chunk)
+    chunk, i = _get_next_chunk(tokens, start)
+    extend(chunk)
     if tracker is not None:
         tracker.view(chunk)
 
-    while len(tokens) > 0 and is_binop(tokens[0]) and (tracker is None or not tracker.op_breaks_chain(tokens[0])) and tokens[0] not in op_blacklist:
+    while i < n:
+        token = tokens[i]
+        if not token.kind & binop_flag \
+        or tracker is not None and tracker.op_breaks_chain(token) \
+        or op_blacklist is not None and token in op_blacklist:
+            break
+
         # get the operator, and continuing chunk, then let the tracker view it
-        chain.append(tokens.pop(0))
-        chunk, tokens = _get_next_chunk(tokens)
-        chain.extend(chunk)
+        append(token)
+        chunk, i = _get_next_chunk(tokens, i + 1)
+        extend(chunk)
         if tracker is not None:
             tracker.view(chunk)
 
     # if there's a semicolon, it ends the chain
-    if len(tokens) > 0 and isinstance(tokens[0], Operator_t) and tokens[0].op == ';':
-        chain.append(tokens.pop(0))
+    if i < n and (token := tokens[i]).__class__ is Operator_t and token.op == ';':
+        append(token)
+        i += 1
 
-    return Chain(chain), tokens
+    return Chain(chain), i
 
 
 def narrow_juxtapose(tokens: list[Token]) -> None:
@@ -482,17 +526,18 @@ def narrow_juxtapose(tokens: list[Token]) -> None:
     convert [<token>, <jux>, <type_param>] into [<token>, <type_param_jux>, <type_param>]
     convert [<type_param>, <jux>, <token>] into [<type_param>, <type_param_jux>, <token>]
     """
-    range_jux = RangeJuxtapose_t(None)
-    ellipsis_jux = EllipsisJuxtapose_t(None)
-    backticks_jux = BackticksJuxtapose_t(None)
-    type_param_jux = TypeParamJuxtapose_t(None)
     undefined = Undefined_t(None)
     for i, token, stream in (gen := full_traverse_tokens(tokens)):
+        # only these (exact) token types have their juxtaposes narrowed
+        token_type = token.__class__
+        if token_type not in jux_atoms and token_type is not TypeParam_t:
+            continue
+
         left_is_jux = i > 0 and isinstance(stream[i-1], Juxtapose_t)
         right_is_jux = i + 1 < len(stream) and isinstance(stream[i+1], Juxtapose_t)
 
         # handle range jux
-        if isinstance(token, DotDot_t):
+        if token_type is DotDot_t:
             if i + 1 < len(stream):
                 if isinstance(stream[i+1], Juxtapose_t):
                     stream[i+1] = range_jux
@@ -506,7 +551,7 @@ def narrow_juxtapose(tokens: list[Token]) -> None:
                     gen.send(i+3)
 
         # handle ellipsis jux
-        elif isinstance(token, DotDotDot_t):
+        elif token_type is DotDotDot_t:
             # ellipsis can be optionally juxtaposed, but when it is juxtaposed, it may only be juxtaposed on one side
             if left_is_jux and right_is_jux:
                 raise ValueError(f"ERROR: ellipsis operator {token} must be juxtaposed on either zero or one side. Got ...{stream[i-2:i+3]}...")
@@ -516,14 +561,14 @@ def narrow_juxtapose(tokens: list[Token]) -> None:
                 stream[i+1] = ellipsis_jux
 
         # handle type param jux
-        elif isinstance(token, TypeParam_t):
+        elif token_type is TypeParam_t:
             if left_is_jux:
                 stream[i-1] = type_param_jux
             elif right_is_jux:
                 stream[i+1] = type_param_jux
 
         # handle backticks jux
-        elif isinstance(token, Backticks_t):
+        elif token_type is Backticks_t:
             # only left or right can be juxtaposed, but not both, and not neither
             if (left_is_jux and right_is_jux) or (not left_is_jux and not right_is_jux):
                 raise ValueError(f"ERROR: backticks operator {token} must be juxtaposed on a exactly one side. Got ...{stream[i-2:i+3]}...")
@@ -553,9 +598,8 @@ def bundle_conditionals(tokens: list[Token]) -> None:
     """
     for i, token, stream in (gen := full_traverse_tokens(tokens)):
         if isinstance(token, Keyword_t) and token.src in ('if', 'loop', 'lazy'):
-            flow_chain, tokens = get_next_chain(stream[i:])
-            stream[i] = flow_chain[0]
-            stream[i+1:] = [*flow_chain[1:], *tokens]
+            flow_chain, end = get_next_chain(stream, i)
+            stream[i:end] = flow_chain
 
 
 def make_chain_operators(tokens: list[Token]) -> None:
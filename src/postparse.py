@@ -94,7 +94,7 @@ def post_parse(ast: AST) -> AST:
 def convert_prototype_identifiers(ast: AST) -> AST:
     """Convert all PrototypeIdentifiers to either Identifier or Express, depending on the context"""
     ast = Group([ast])
-    for i in (gen := ast.__full_traversal_iter__()):
+    for parent, key, index, i in ast.__full_traversal_slots_iter__():
 
         # skip ASTs that don't have any Prototypes
         if i.is_settled():
@@ -102,35 +102,35 @@ def convert_prototype_identifiers(ast: AST) -> AST:
 
         # if we ever get to a bare identifier, treat it like an express
         if isinstance(i, PrototypeIdentifier):
-            gen.send(Express(Identifier(i.name)))
+            parent.replace_child(key, Express(Identifier(i.name)), index)
             continue
 
         match i:
             case Call(f=PrototypeIdentifier(name=name), args=args):
-                gen.send(Call(Identifier(name), args))
+                parent.replace_child(key, Call(Identifier(name), args), index)
             case Call(args=None) | Call(f=AtHandle()) | Call(f=Group()): ...
             # case Call(args=args): ... #TODO: handling when args is not none... generally will be a list of identifiers that need to be converted directly to Identifier
             case Call():
                 pdb.set_trace()
                 ...
             case AtHandle(operand=PrototypeIdentifier(name=name)):
-                gen.send(AtHandle(Identifier(name)))
+                parent.replace_child(key, AtHandle(Identifier(name)), index)
             case AtHandle():
                 pdb.set_trace()
                 ...          
             case Assign(left=PrototypeIdentifier(name=name), right=right):
-                gen.send(Assign(Identifier(name), right))
+                parent.replace_child(key, Assign(Identifier(name), right), index)
             case Assign(left=Array() as arr, right=right):
                 target = convert_prototype_to_unpack_target(arr)
-                gen.send(Assign(target, right))
+                parent.replace_child(key, Assign(target, right), index)
             case Assign():
                 pdb.set_trace()
                 ...
             case IterIn(left=PrototypeIdentifier(name=name), right=right):
-                gen.send(IterIn(Identifier(name), right))
+                parent.replace_child(key, IterIn(Identifier(name), right), index)
             case IterIn(left=Array() as arr, right=right):
                 target = convert_prototype_to_unpack_target(arr)
-                gen.send(IterIn(target, right))
+                parent.replace_child(key, IterIn(target, right), index)
             case IterIn():
                 pdb.set_trace()
                 ...
@@ -138,7 +138,7 @@ def convert_prototype_identifiers(ast: AST) -> AST:
                 pdb.set_trace()
                 ...
             case Declare(decltype=decltype, target=PrototypeIdentifier(name=name)):
-                gen.send(Declare(decltype, Identifier(name)))
+                parent.replace_child(key, Declare(decltype, Identifier(name)), index)
             case Declare(decltype=decltype, target=Array() as arr):
                 pdb.set_trace()
                 ...
@@ -148,9 +148,9 @@ def convert_prototype_identifiers(ast: AST) -> AST:
             case Declare(): ... # all other declare cases are handled as normal
             case Index(): ... # I think all index cases are handled as normal
             case Access(left=left, right=PrototypeIdentifier(name=name)):
-                gen.send(Access(left, Identifier(name)))
+                parent.replace_child(key, Access(left, Identifier(name)), index)
             case Access(left=left, right=AtHandle(operand=PrototypeIdentifier(name=name))):
-                gen.send(Access(left, AtHandle(Identifier(name))))
+                parent.replace_child(key, Access(left, AtHandle(Identifier(name))), index)
             case Access():
                 pdb.set_trace()
                 ...
@@ -175,17 +175,17 @@ def convert_prototype_identifiers(ast: AST) -> AST:
 #      because array unpack and object unpack can look the same syntactically
 def convert_prototype_to_unpack_target(ast: Array) -> UnpackTarget:
     """Convert an Array of PrototypeIdentifiers or other ASTs to an UnpackTarget"""
-    for i in (gen := ast.__full_traversal_iter__()):
+    for parent, key, index, i in ast.__full_traversal_slots_iter__():
         if i.is_settled():
             continue
 
         match i:
             case PrototypeIdentifier(name=name):
-                gen.send(Identifier(name))
+                parent.replace_child(key, Identifier(name), index)
             case Assign(left=PrototypeIdentifier(name=name), right=right):
-                gen.send(Assign(Identifier(name), right))
+                parent.replace_child(key, Assign(Identifier(name), right), index)
             case Array() as arr:
-                gen.send(convert_prototype_to_unpack_target(arr))
+                parent.replace_child(key, convert_prototype_to_unpack_target(arr), index)
             case CollectInto(): ...
             case TypedIdentifier(): ...
             case _:
@@ -197,35 +197,35 @@ def convert_prototype_to_unpack_target(ast: Array) -> UnpackTarget:
 def convert_prototype_tuples(ast: AST) -> AST:
     """For now, literally just turn all tuples into arrays"""
     ast = Group([ast])
-    for i in (gen := ast.__full_traversal_iter__()):
+    for parent, key, index, i in ast.__full_traversal_slots_iter__():
         if isinstance(i, PrototypeTuple):
-            gen.send(Array(i.items))
+            parent.replace_child(key, Array(i.items), index)
     return ast.items[0]
 
 def convert_bare_ranges(ast: AST) -> AST:
     """Convert all BareRanges to Ranges with inclusive bounds"""
     ast = Group([ast])
-    for i in (gen := ast.__full_traversal_iter__()):
+    for parent, key, index, i in ast.__full_traversal_slots_iter__():
         if isinstance(i, BareRange):
-            gen.send(Range(i.left, i.right, '[]'))
+            parent.replace_child(key, Range(i.left, i.right, '[]'), index)
     return ast.items[0]
 
 
 def convert_bare_ellipses(ast: AST) -> AST:
     """Convert all remaining DotDotDots (that were not juxtaposed) to Ellipsis"""
     ast = Group([ast])
-    for i in (gen := ast.__full_traversal_iter__()):
+    for parent, key, index, i in ast.__full_traversal_slots_iter__():
         if isinstance(i, DotDotDot):
-            gen.send(Ellipsis())
+            parent.replace_child(key, Ellipsis(), index)
     return ast.items[0]
 
 
 def convert_prototype_function_literals(ast: AST) -> AST:
     ast = Group([ast])
-    for i in (gen := ast.__full_traversal_iter__()):
+    for parent, key, index, i in ast.__full_traversal_slots_iter__():
         if isinstance(i, PrototypeFunctionLiteral):
             args = normalize_function_args(i.args)
-            gen.send(FunctionLiteral(args, i.body))
+            parent.replace_child(key, FunctionLiteral(args, i.body), index)
     return ast.items[0]
 
 
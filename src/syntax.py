@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod, ABCMeta
-from typing import get_args, get_origin, Generator, Any, Literal, Union, dataclass_transform, Callable as TypingCallable
+from typing import get_args, get_origin, get_type_hints, Generator, Any, Literal, Union, dataclass_transform, Callable as TypingCallable
 from types import UnionType
-from dataclasses import dataclass, field, fields
+from dataclasses import dataclass, field, fields, is_dataclass
+from inspect import isabstract
 from enum import Enum, auto
+import sys
 # from fractions import Fraction
 
 from .tokenizer import Operator_t, escape_whitespace  # TODO: move into utils
@@ -10,16 +12,70 @@ from .tokenizer import Operator_t, escape_whitespace  # TODO: move into utils
 import pdb
 
 
+# tree drawing components for AST.__repr__
+# prefix components:
+tree_space = '    '
+tree_branch = '│   '
+# pointers:
+tree_tee = '├── '
+tree_last = '└── '
+
+
 @dataclass_transform()
-class AST(ABC):
-    def __init_subclass__(cls: type['AST'], **kwargs):
-        """
-        - automatically applies the dataclass decorator with repr=False to AST subclasses
-        """
-        super().__init_subclass__(**kwargs)
+class ASTMeta(ABCMeta):
+    """
+    Metaclass for ASTs that:
+    - automatically applies the dataclass decorator with repr=False and slots=True to AST subclasses
+    - classifies each field of the dataclass (see field_kind)
+
+    This is a metaclass rather than AST.__init_subclass__ because dataclass(slots=True) creates a new class,
+    which can only take the place of the class being defined if it is returned from the metaclass
+    """
+    def __new__(mcls, name: str, bases: tuple[type, ...], namespace: dict[str, Any], **kwargs):
+        is_ast_subclass = any(isinstance(base, ASTMeta) for base in bases)
+        adds_fields = bool(namespace.get('__annotations__'))
+
+        # classes that don't add any fields can be given their (empty) slots directly, rather than dataclass rebuilding them
+        if is_ast_subclass and not adds_fields:
+            namespace.setdefault('__slots__', ())
+
+        cls = super().__new__(mcls, name, bases, namespace, **kwargs)
+
+        # skip AST itself, and the slotted class that dataclass creates from an already processed class
+        if '__dataclass_fields__' in namespace or not is_ast_subclass:
+            return cls
 
-        # Apply the dataclass decorator with repr=False to the subclass
-        dataclass(repr=False)(cls)
+        # skip classes without new fields that are abstract, or already inherit everything from a dataclass (e.g. BinOp subclasses)
+        if not adds_fields and (is_dataclass(cls) or isabstract(cls)):
+            return cls
+
+        # Apply the dataclass decorator to the subclass. Classes that declare their own __slots__ (e.g. abstract bases) keep them
+        cls = dataclass(repr=False, slots='__slots__' not in namespace)(cls)
+
+        # point the __class__ cell (used by zero-argument super()) at the new class instead of the one it replaced.
+        # Otherwise super() in a method would be bound to the discarded class, which instances are not instances of.
+        # The cell is only shared by functions defined in this class body, and nothing else refers to the discarded class
+        if '__classcell__' in namespace:
+            namespace['__classcell__'].cell_contents = cls
+
+        # resolve string annotations (e.g. forward references) where possible. The class itself isn't bound in its module yet
+        try:
+            hints = get_type_hints(cls, localns={name: cls})
+        except NameError:
+            hints = {}
+
+        # classify each field once, so member iteration doesn't need to inspect annotations per call
+        cls._field_kinds = tuple((f.name, field_kind(hints.get(f.name, f.type))) for f in fields(cls))
+        # (name, is_list) for just the fields that may contain child ASTs
+        cls._ast_child_fields = tuple((key, kind == AST_LIST) for key, kind in cls._field_kinds if kind != SCALAR)
+
+        return cls
+
+
+class AST(ABC, metaclass=ASTMeta):
+    # abstract bases declare empty __slots__ so that they don't force a __dict__ onto subclasses that use slots
+    # _settled caches a True result of is_settled (unset otherwise)
+    __slots__ = ('_settled',)
 
     # TODO: add property to all ASTs for function complete/locked/etc. meaning it and all children are settled
     @abstractmethod
@@ -42,37 +98,31 @@ class AST(ABC):
         Where all non-ast attributes of a node are printed on the same line as the node itself
         and all children are recursively indented a level and printed on their own line
         """
-        return '\n'.join(self._gentree())
+        lines = []
+        self._gentree(lines)
+        return '\n'.join(lines)
 
-    def _gentree(self, prefix: str = '') -> Generator[str, None, None]:
+    def _gentree(self, lines: list[str], head: str = '', prefix: str = '') -> None:
         """
-        a recursive generator helper function for __repr__
+        a recursive helper function for __repr__ that appends each line of the tree to a shared list
 
         Args:
-            prefix: str - the string to prepend to each child line (root line already has prefix)
-            name: str - the name of the current node in the tree
-            # draw_branches: bool - whether each item should be drawn with branches or only use whitespace
-
-        Returns:
-            str: the string representation of the AST tree
+            lines: list[str] - the accumulated lines of the AST tree
+            head: str - the string to prepend to the first line of this node (i.e. the prefix, pointer and name)
+            prefix: str - the string to prepend to each child line
         """
-        # prefix components:
-        space = '    '
-        branch = '│   '
-        # pointers:
-        tee = '├── '
-        last = '└── '
-
-        attrs_str = ', '.join(f'{k}={v}' for k, v in self.__iter_members__() if not isinstance(v, AST))
-        yield f'{self.__class__.__name__}({attrs_str})'
-        children = tuple((k, v) for k, v in self.__iter_members__() if isinstance(v, AST))
-        pointers = [tee] * (len(children) - 1) + [last]
-        for (k, v), pointer in zip(children, pointers):
-            extension = branch if pointer == tee else space
-            gen = v._gentree(f'{prefix}{extension}')
+        attrs, children = [], []
+        for k, v in self.__iter_members__():
+            (children if isinstance(v, AST) else attrs).append((k, v))
+        attrs_str = ', '.join(f'{k}={v}' for k, v in attrs)
+        lines.append(f'{head}{self.__class__.__name__}({attrs_str})')
+        n = len(children)
+        for i, (k, v) in enumerate(children):
+            is_last = i == n - 1
+            pointer = tree_last if is_last else tree_tee
+            extension = tree_space if is_last else tree_branch
             name = f'{k}=' if k else ''
-            yield f'{prefix}{pointer}{name}{next(gen)}'     # first line gets name and pointer
-            yield from gen                                  # rest of lines already have a prefix
+            v._gentree(lines, f'{prefix}{pointer}{name}', f'{prefix}{extension}')
 
     def __iter_members__(self) -> Generator[tuple[str, Any], 'AST', None]:
         """
@@ -81,16 +131,21 @@ class AST(ABC):
         Allows replacing the current AST with a new one during iteration via .send()
         NOTE: Does not recurse into child ASTs
         """
-        for key, value in self.__dict__.items():
+        for key, kind in self._field_kinds:
+            value = getattr(self, key)
+
             # any direct children are ASTs
-            if isinstance(value, AST):
+            if kind != SCALAR and isinstance(value, AST):
                 replacement = yield key, value
                 if replacement is not None:
-                    setattr(self, key, replacement)
+                    self.replace_child(key, replacement)
                     yield
 
+            elif kind == AST_OPTIONAL and value is None:
+                continue
+
             # any direct children are containers of ASTs
-            elif is_ast_container(self.__class__.__annotations__.get(key)):
+            elif kind == AST_LIST:
                 if value is None:
                     continue
 
@@ -98,7 +153,7 @@ class AST(ABC):
                     for i, item in enumerate(value):
                         replacement = yield '', item
                         if replacement is not None:
-                            value[i] = replacement
+                            self.replace_child(key, replacement, i)
                             yield
                 # elif isinstance(value, some_other_container_type): ...
                 else:
@@ -115,36 +170,120 @@ class AST(ABC):
         """DEPRECATED: Use __iter_asts__ instead"""
         raise DeprecationWarning(f'__iter__ is deprecated. Use __iter_asts__ instead')
 
+    def _iter_child_slots(self) -> Generator[tuple[str, int | None, 'AST'], None, None]:
+        """
+        Yield (property_name, index, child) for each direct child AST of the AST instance
+        index is None for children stored directly on the property, or the position of the child in a container of ASTs
+        """
+        for key, is_list in self._ast_child_fields:
+            value = getattr(self, key)
+            if isinstance(value, AST):
+                yield key, None, value
+            elif is_list and value is not None:
+                if not isinstance(value, list):
+                    raise NotImplementedError(f'iterating child ASTs over {type(value)} (from member "{key}") of {self} is not yet implemented')
+                for i, item in enumerate(value):
+                    if isinstance(item, AST):
+                        yield key, i, item
+
+    def _ast_children(self) -> list[tuple[str, 'AST']]:
+        """
+        Return a list of (property_name, child) for the direct children ASTs of the AST instance
+        Eager equivalent of filtering __iter_members__ for ASTs (which is only needed for replacement via .send())
+        Items from containers of ASTs have an empty property name
+        """
+        return [(key if index is None else '', child) for key, index, child in self._iter_child_slots()]
+
+    def _ast_children_vals(self) -> list['AST']:
+        """Return a list of the direct children ASTs of the AST instance (i.e. _ast_children without the names)"""
+        return [child for _, _, child in self._iter_child_slots()]
+
+    def _child_slots(self) -> list[tuple[str, int | None]]:
+        """Return a list of (property_name, index) locating each direct child AST of the AST instance (see _iter_child_slots)"""
+        return [(key, index) for key, index, _ in self._iter_child_slots()]
+
+    def get_child(self, key: str, index: int | None = None) -> 'AST':
+        """Get the child AST at the given slot (see _child_slots)"""
+        if index is None:
+            return getattr(self, key)
+        return getattr(self, key)[index]
+
+    def replace_child(self, key: str, new: 'AST', index: int | None = None) -> None:
+        """Replace the child AST at the given slot (see _child_slots) with a new AST"""
+        if index is None:
+            setattr(self, key, new)
+        else:
+            getattr(self, key)[index] = new
+        self._settled = False
+
     def __iter_asts__(self) -> Generator['AST', None, None]:
-        """Return a generator of the direct children ASTs of the AST"""
-        for _, child in self.__iter_members__():
-            if isinstance(child, AST):
-                yield child
+        """Return an iterator over the direct children ASTs of the AST"""
+        return iter(self._ast_children_vals())
 
 
-    def __full_traversal_iter__(self) -> Generator['AST', 'AST', None]:
+    def __full_traversal_iter__(self) -> Generator['AST', None, None]:
         """
-        Recursive in-order traversal of all child ASTs of the current AST instance
-        Has ability to replace the current AST with a new one during iteration via .send()
+        Read-only pre-order traversal of all child ASTs of the current AST instance
+        For replacing ASTs during traversal, use __full_traversal_slots_iter__
         """
-        for _, child in (gen := self.__iter_members__()):
-            if isinstance(child, AST):
-                replacement = yield child
-                if replacement is not None:
-                    gen.send(replacement)
-                    yield
-                    child = replacement # allow traversal over all children of the replacement
-                yield from child.__full_traversal_iter__()
+        stack = self._ast_children_vals()
+        stack.reverse()
+        while stack:
+            child = stack.pop()
+            yield child
+            children = child._ast_children_vals()
+            children.reverse()
+            stack.extend(children)
+
+    def __full_traversal_slots_iter__(self) -> Generator[tuple['AST', str, int | None, 'AST'], None, None]:
+        """
+        Pre-order traversal of all child ASTs of the current AST instance, yielding (parent, key, index, child)
+        The child may be replaced during iteration via parent.replace_child(key, new, index),
+        in which case traversal continues over the children of the replacement,
+        and the cached is_settled result of every ancestor of the replaced child is cleared
+        """
+        # each entry carries the ancestors above its parent as nested (node, above) pairs, so they can be cleared on the way back up
+        stack = [(self, key, index, None) for key, index in reversed(self._child_slots())]
+        while stack:
+            parent, key, index, above = stack.pop()
+            child = parent.get_child(key, index)
+            yield parent, key, index, child
+            new = parent.get_child(key, index) # re-read in case the child was replaced
+            if new is not child:
+                # replace_child already cleared the parent
+                while above is not None:
+                    node, above = above
+                    node._settled = False
+            path = (parent, above)
+            stack.extend((new, k, i, path) for k, i in reversed(new._child_slots()))
 
 
     def is_settled(self) -> bool:
-        """Return True if the neither the AST, nor any of its descendants, are prototypes"""
-        for child in self.__iter_asts__():
-            if not child.is_settled():
-                return False
+        """
+        Return True if the neither the AST, nor any of its descendants, are prototypes
+        A True result is cached on the instance. replace_child clears the cache on the node it modifies,
+        and __full_traversal_slots_iter__ also clears it on that node's ancestors.
+        NOTE: replacing a child outside of __full_traversal_slots_iter__ does not clear the ancestors of the modified node
+        """
+        if getattr(self, '_settled', False):
+            return True
+
+        stack = self._ast_children_vals()
+        while stack:
+            node = stack.pop()
+            # defer to subclasses that override is_settled (e.g. PrototypeAST)
+            if type(node).is_settled is not AST.is_settled:
+                if not node.is_settled():
+                    return False
+            elif not getattr(node, '_settled', False):
+                stack.extend(node._ast_children_vals())
+
+        self._settled = True
         return True
 
 
+container_origins = {list, set, tuple, frozenset}
+
 def is_ast_container(type_hint: type | None) -> bool:
     """
     Determine if the type hint is a container of ASTs.
@@ -156,18 +295,10 @@ def is_ast_container(type_hint: type | None) -> bool:
     Returns:
         bool: True if any of the contained types are subclasses of AST, False otherwise
     """
-    if type_hint is None:
+    # anything that isn't a container type (e.g. None, unions, class constructors, callables, etc.) is rejected immediately
+    if get_origin(type_hint) not in container_origins:
         return False
 
-    # class constructors are not containers
-    if get_origin(type_hint) is type:
-        return False
-
-    # python callables are not containers regardless of if they take in or return ASTs
-    if get_origin(type_hint) == get_origin(TypingCallable):
-        return False
-
-
     # Iterate over all contained types
     args = get_args(type_hint)
     for arg in args:
@@ -186,8 +317,46 @@ def is_ast_container(type_hint: type | None) -> bool:
     return False
 
 
+# field kinds, determined from a field's type annotation
+SCALAR = 0          # can never hold an AST
+AST_DIRECT = 1      # may hold an AST (checked per instance)
+AST_OPTIONAL = 2    # union that may hold an AST (e.g. Call | None). Omitted from members when None
+AST_LIST = 3        # container of ASTs
+
+scalar_types = (str, int, float, bool, type(None), Enum)
+
+
+def field_kind(type_hint: Any) -> int:
+    """
+    Classify a field by its type annotation into SCALAR, AST_DIRECT, AST_OPTIONAL, or AST_LIST.
+    Anything that can't be ruled out as holding an AST (e.g. unresolved string annotations) is AST_DIRECT
+    """
+    if is_scalar_type(type_hint):
+        return SCALAR
+    if get_origin(type_hint) is Union or isinstance(type_hint, UnionType):
+        if any(isinstance(arg, type) and issubclass(arg, AST) for arg in get_args(type_hint)):
+            return AST_OPTIONAL
+        return AST_DIRECT
+    if is_ast_container(type_hint):
+        return AST_LIST
+    return AST_DIRECT
+
+
+def is_scalar_type(type_hint: Any) -> bool:
+    """Determine if the type hint only admits values that can never be ASTs (e.g. str, int | None, type[AST], Literal[...])"""
+    if isinstance(type_hint, type):
+        return issubclass(type_hint, scalar_types)
+    origin = get_origin(type_hint)
+    if origin is type or origin is Literal:
+        return True
+    if origin is Union or isinstance(type_hint, UnionType):
+        return all(is_scalar_type(arg) for arg in get_args(type_hint))
+    return False
+
+
 class PrototypeAST(AST, ABC):
     """Used to represent AST nodes that are not complete, and must be removed before the whole AST is evaluated"""
+    __slots__ = ()
 
     def is_settled(self) -> bool:
         """By definition, prototypes are not settled"""
@@ -196,6 +365,7 @@ class PrototypeAST(AST, ABC):
 
 class Delimited(ABC):
     """used to track which ASTs are printed with their own delimiter so they can be juxtaposed without extra parentheses"""
+    __slots__ = ()
 
 class TypeParam(AST, Delimited):
     items: list[AST]
@@ -224,9 +394,11 @@ untyped = Type(Untyped)
 
 class Undefined(AST):
     """undefined singleton"""
+    instance = None # (not annotated so that it isn't a dataclass field)
+
     def __new__(cls):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super(Undefined, cls).__new__(cls)
+        if cls.instance is None:
+            cls.instance = super().__new__(cls)
         return cls.instance
 
     def __str__(self) -> str:
@@ -239,9 +411,11 @@ undefined = Undefined()
 
 class Void(AST):
     """void singleton"""
+    instance = None # (not annotated so that it isn't a dataclass field)
+
     def __new__(cls):
-        if not hasattr(cls, 'instance'):
-            cls.instance = super(Void, cls).__new__(cls)
+        if cls.instance is None:
+            cls.instance = super().__new__(cls)
         return cls.instance
 
     def __str__(self) -> str:
@@ -303,7 +477,7 @@ class Bool(AST):
     val: bool
 
     def __str__(self) -> str:
-        return str(self.val).lower()
+        return 'true' if self.val else 'false'
 
 
 class Int(AST):
@@ -313,6 +487,21 @@ class Int(AST):
         return str(self.val)
 
 
+# interned literal ASTs. Literals are never mutated, so the same instance can be shared by every occurrence
+bools: dict[bool, Bool] = {True: Bool(True), False: Bool(False)}
+# small ints are similar to python's small int cache. Only non-negative values are needed, since literals are parsed
+# as non-negative ints, and negative literals as a prefix negation
+small_ints: dict[int, Int] = {i: Int(i) for i in range(257)}
+
+def make_bool(val: bool) -> Bool:
+    return bools[val]
+
+def make_int(val: int) -> Int:
+    if type(val) is int and (ast := small_ints.get(val)) is not None:
+        return ast
+    return Int(val)
+
+
 class String(AST, Delimited):
     val: str
 
@@ -324,12 +513,7 @@ class IString(AST, Delimited):
     parts: list[AST]
 
     def __str__(self):
-        s = ''
-        for part in self.parts:
-            if isinstance(part, String):
-                s += part.val
-            else:
-                s += f'{part}'
+        s = ''.join(escape_whitespace(part.val) if isinstance(part, String) else str(part) for part in self.parts)
         return f'"{s}"'
 
 
@@ -403,20 +587,49 @@ class Call(AST):
             return f'{self.f}{self.args}'
         return f'{self.f}({self.args})'
 
-from typing import cast
-class BinOp(AST, ABC):
+def specialized(method: TypingCallable) -> TypingCallable:
+    """mark a method as generated per subclass (so that further subclasses regenerate it rather than treating it as custom)"""
+    method._specialized = True
+    return method
+
+def is_specialized(method: TypingCallable) -> bool:
+    return getattr(method, '_specialized', False)
+
+
+class OpAST(AST, ABC):
+    """
+    Base for the kinds of operator AST (BinOp, UnaryPrefixOp, UnaryPostfixOp).
+    Each kind provides `_make_str`, and its subclasses only set the operator string `_op` (and optionally `_space`)
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if OpAST in cls.__bases__:
+            return # the kinds themselves don't have an operator
+
+        assert isinstance(getattr(cls, '_op', None), str), f'{cls.__base__.__name__} subclass "{cls.__name__}" must define an `_op` attribute'
+        cls._op = sys.intern(cls._op)
+
+        # bake the operator (and spacing) into __str__, unless a custom __str__ was written
+        if getattr(cls.__str__, '__isabstractmethod__', False) or is_specialized(cls.__str__):
+            cls.__str__ = specialized(cls._make_str())
+
+    @classmethod
+    @abstractmethod
+    def _make_str(cls) -> TypingCallable[[Any], str]: ...
+
+
+class BinOp(OpAST):
     left: AST
     right: AST
+    _space = True
 
-    def __post_init__(self):
-        self._space = cast(bool, getattr(self, '_space', True))
-        self._op = cast(str, getattr(self, '_op', None))
-        assert isinstance(self._op, str), f'BinOp subclass "{self.__class__.__name__}" must define an `_op` attribute'
-
-    def __str__(self) -> str:
-        if self._space:
-            return f'{self.left} {self._op} {self.right}'
-        return f'{self.left}{self._op}{self.right}'
+    @classmethod
+    def _make_str(cls):
+        sep = f' {cls._op} ' if cls._space else cls._op
+        def __str__(self) -> str:
+            return f'{self.left}{sep}{self.right}'
+        return __str__
 
 class Assign(BinOp):
     _op = '='
@@ -514,18 +727,17 @@ class IterIn(BinOp):
 class MemberIn(BinOp):
     _op = 'in?'
 
-class UnaryPrefixOp(AST, ABC):
-    operand: AST
 
-    def __post_init__(self):
-        self._space = cast(bool, getattr(self, '_space', False))
-        self._op = cast(str, getattr(self, '_op', None))
-        assert isinstance(self._op, str), f'UnaryPrefixOp subclass "{self.__class__.__name__}" must define an `_op` attribute'
+class UnaryPrefixOp(OpAST):
+    operand: AST
+    _space = False
 
-    def __str__(self) -> str:
-        if self._space:
-            return f'{self._op} {self.operand}'
-        return f'{self._op}{self.operand}'
+    @classmethod
+    def _make_str(cls):
+        prefix = f'{cls._op} ' if cls._space else cls._op
+        def __str__(self) -> str:
+            return f'{prefix}{self.operand}'
+        return __str__
 
 class Not(UnaryPrefixOp):
     _op = 'not'
@@ -544,7 +756,6 @@ class UnaryDiv(UnaryPrefixOp):
     _op = '/'
 
 
-
 class AtHandle(UnaryPrefixOp):
     _op = '@'
     def __str__(self):
@@ -553,15 +764,15 @@ class AtHandle(UnaryPrefixOp):
         return f'@({self.operand})'
 
 
-class UnaryPostfixOp(AST, ABC):
+class UnaryPostfixOp(OpAST):
     operand: AST
 
-    def __post_init__(self):
-        self._op = cast(str, getattr(self, '_op', None))
-        assert isinstance(self._op, str), f'UnaryPostfixOp subclass "{self.__class__.__name__}" must define an `_op` attribute'
-
-    def __str__(self) -> str:
-        return f'{self.operand}{self._op}'
+    @classmethod
+    def _make_str(cls):
+        postfix = cls._op
+        def __str__(self) -> str:
+            return f'{self.operand}{postfix}'
+        return __str__
 
 class Suppress(UnaryPostfixOp):
     _op = ';'
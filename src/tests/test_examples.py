@@ -1,32 +1,49 @@
 from pathlib import Path
+import io
+import sys
+import pytest
 from ..backend.python import python_interpreter
+from ..utils import Options
 import pdb
 
-def test_examples():
-    current_test_cases = [
-        'hello.dewy',
-        'hello_func.dewy',
-        'hello_name.dewy',
-        'hello_loop.dewy',
-        'anonymous_func.dewy',
-        'containers.dewy',
-        'if_else.dewy',
-        'if_else_if.dewy',
-        'dangling_else.dewy',
-        'if_tree.dewy',
-        'loop_in_iter.dewy',
-        'loop_and_iters.dewy',
-        'enumerate_list.dewy',
-        'loop_or_iters.dewy',
-        'nested_loop.dewy',
-        'block_printing.dewy',
-        'fizzbuzz-1.dewy',
-    ]
-    example_root = Path(__file__).parent.parent.parent / 'examples'
+
+current_test_cases = [
+    'hello.dewy',
+    'hello_func.dewy',
+    'hello_name.dewy',
+    'hello_loop.dewy',
+    'anonymous_func.dewy',
+    pytest.param('containers.dewy', marks=pytest.mark.xfail(raises=NotImplementedError, strict=True, reason='blocks with multiple expressions are not yet supported')),
+    'if_else.dewy',
+    'if_else_if.dewy',
+    'dangling_else.dewy',
+    'if_tree.dewy',
+    'loop_in_iter.dewy',
+    'loop_and_iters.dewy',
+    'enumerate_list.dewy',
+    'loop_or_iters.dewy',
+    'nested_loop.dewy',
+    'block_printing.dewy',
+    'fizzbuzz-1.dewy',
+]
+example_root = Path(__file__).parent.parent.parent / 'examples'
+
+
+@pytest.mark.parametrize('filename', current_test_cases)
+def test_example(filename: str, monkeypatch: pytest.MonkeyPatch):
+    # examples that read input (e.g. hello_name.dewy) get a canned response rather than blocking on stdin
+    monkeypatch.setattr(sys, 'stdin', io.StringIO('Dewy\n'))
+    python_interpreter(example_root / filename, [], Options(tokens=False, verbose=False))
+
+
+def run_examples():
+    """run all the examples directly (reading any input from the terminal)"""
     for filename in current_test_cases:
+        if not isinstance(filename, str):
+            continue
         example_path = example_root / filename
         print(f'running {example_path.relative_to(example_root)}')
-        python_interpreter(example_path, [])
+        python_interpreter(example_path, [], Options(tokens=False, verbose=False))
 
 if __name__ == '__main__':
-    test_examples()
+    run_examples()
@@ -0,0 +1,44 @@
+from pathlib import Path
+import pytest
+from ..tokenizer import tokenize
+from ..postok import post_process
+from ..parser import top_level_parse, AmbiguousPrecedenceError
+from ..syntax import AST
+from ..utils import CoordString
+
+
+example_root = Path(__file__).parent.parent.parent / 'examples'
+
+
+def parse_src(src: str) -> AST:
+    tokens = tokenize(src)
+    post_process(tokens)
+    return top_level_parse(tokens)
+
+
+def test_expected_atom_reports_offending_token():
+    with pytest.raises(ValueError, match=r"expected atom, got tokens\[i\]=<Operator_t: `%`>"):
+        parse_src('%')
+
+
+def test_expected_atom_reports_empty_remainder():
+    with pytest.raises(ValueError, match=r"expected atom, got tokens\[i:\]=\[\]"):
+        parse_src('x = 5 %')
+
+
+def test_ambiguous_precedence_raises_instead_of_breakpoint():
+    with pytest.raises(AmbiguousPrecedenceError):
+        parse_src((example_root / 'bugs.dewy').read_text())
+
+
+def test_identifier_names_keep_coordinates():
+    tokens = tokenize('x = 1\nprintl(x)')
+    post_process(tokens)
+    ast = top_level_parse(tokens)
+    first, second = ast.items[0].left, ast.items[1].mul.right.items[0]
+
+    # each use of a name is its own node, with the coordinates of that use
+    assert first is not second
+    assert isinstance(first.name, CoordString) and isinstance(second.name, CoordString)
+    assert first.name.row_col_map == [(0, 0)]
+    assert second.name.row_col_map == [(1, 7)]
@@ -0,0 +1,194 @@
+import copy
+from dataclasses import fields
+import pickle
+import pytest
+from ..postparse import post_parse
+from ..syntax import (
+    Int, Bool, String, IString, Block, PrototypeIdentifier, make_int, make_bool,
+    BinOp, Add, Access, Not, UnaryNeg, AtHandle, Suppress,
+    Call, Group, Identifier, AST, UnpackTarget, AST_LIST, Express,
+)
+
+
+def test_small_int_literals_are_shared():
+    assert make_int(5) is make_int(5)
+    assert make_int(256) is make_int(256)
+    assert make_int(-1) is not make_int(-1)
+    assert make_int(1000) is not make_int(1000)
+    assert make_int(1000) == Int(1000)
+
+
+def test_bool_literals_are_shared():
+    assert make_bool(True) is make_bool(True)
+    assert make_bool(False) is make_bool(False)
+    assert make_bool(True) != make_bool(False)
+
+
+def test_constructing_a_literal_leaves_the_shared_one_alone():
+    shared = make_int(5)
+    other = Int(5)
+    assert other is not shared
+    assert other == shared and shared.val == 5
+
+
+@pytest.mark.parametrize('ast', [make_int(5), Int(1000), make_bool(True), Bool(False)])
+def test_literals_copy_and_pickle(ast):
+    assert copy.copy(ast) == ast
+    assert copy.deepcopy(ast) == ast
+    assert pickle.loads(pickle.dumps(ast)) == ast
+
+
+def test_literal_str():
+    assert str(make_int(5)) == '5'
+    assert str(Int(-1000)) == '-1000'
+    assert str(make_bool(True)) == 'true'
+
+    assert str(String('a\tb')) == '"a\\tb"'
+
+    # literals carry only their value as data
+    assert [f.name for f in fields(String)] == ['val']
+    assert [f.name for f in fields(Int)] == ['val']
+
+
+def test_istring_str_escapes_string_parts():
+    ast = IString([String('hi\n"'), Block([PrototypeIdentifier('name')]), String('\t!')])
+    assert str(ast) == '"hi\\n"{name}\\t!"'
+
+
+def test_operator_str():
+    one, two = make_int(1), make_int(2)
+    assert str(Add(one, two)) == '1 + 2'
+    assert str(Access(one, two)) == '1.2'
+    assert str(Not(one)) == 'not 1'
+    assert str(UnaryNeg(one)) == '-1'
+    assert str(Suppress(one)) == '1;'
+
+    # custom __str__ methods are kept, rather than replaced by the generated one
+    assert str(AtHandle(Add(one, two))) == '@(1 + 2)'
+
+
+def test_operator_subclass_requires_op():
+    with pytest.raises(AssertionError, match='must define an `_op` attribute'):
+        class NoOp(BinOp):
+            pass
+
+
+def test_child_accessors_agree():
+    f, a, b = Identifier('f'), make_int(1), make_int(2)
+    ast = Call(f, Group([a, b]))
+    assert ast._ast_children() == [('f', f), ('args', ast.args)]
+    assert ast.args._ast_children() == [('', a), ('', b)]
+    assert ast.args._ast_children_vals() == [a, b]
+    assert ast.args._child_slots() == [('items', 0), ('items', 1)]
+
+    # optional children that are None are skipped
+    assert Call(f)._child_slots() == [('f', None)]
+
+
+def test_is_settled_sees_replacements_below_cached_ancestors():
+    two = make_int(2)
+    middle = Group([Add(make_int(1), two)])
+    root = Group([middle])
+    assert root.is_settled() and middle.is_settled()
+
+    for parent, key, index, child in root.__full_traversal_slots_iter__():
+        if child is two:
+            parent.replace_child(key, PrototypeIdentifier('x'), index)
+    assert not middle.is_settled()
+    assert not root.is_settled()
+
+
+def test_is_settled_cache_survives_replacements_elsewhere():
+    left, right = Group([make_int(1)]), Group([PrototypeIdentifier('x')])
+    root = Group([left, right])
+    assert left.is_settled()
+
+    for parent, key, index, child in root.__full_traversal_slots_iter__():
+        if isinstance(child, PrototypeIdentifier):
+            parent.replace_child(key, Identifier(child.name), index)
+    assert left._settled
+    assert root.is_settled()
+
+
+def test_is_settled_dispatches_to_overrides():
+    class Pending(AST):
+        def __str__(self):
+            return 'pending'
+        def is_settled(self):
+            return False
+
+    assert not Group([make_int(1), Group([Pending()])]).is_settled()
+
+
+def test_forward_referenced_child_fields_are_traversed():
+    # UnpackTarget's field is a string annotation that refers to UnpackTarget itself
+    assert UnpackTarget._field_kinds == (('target', AST_LIST),)
+
+    a, b = Identifier('a'), Identifier('b')
+    nested = UnpackTarget([b])
+    ast = UnpackTarget([a, nested])
+    assert list(ast.__full_traversal_iter__()) == [a, nested, b]
+
+
+def test_zero_argument_super_in_ast_methods():
+    class Loud(AST):
+        val: int
+        def __str__(self):
+            return 'loud'
+        def __repr__(self):
+            return super().__repr__().upper()
+
+    assert repr(Loud(1)) == 'LOUD(VAL=1)'
+
+
+def test_replace_child_on_direct_optional_and_list_fields():
+    f, g = Identifier('f'), Identifier('g')
+    one, two = make_int(1), make_int(2)
+    ast = Call(f, Group([one]))
+
+    ast.replace_child('f', g)
+    assert ast.f is g and ast.get_child('f') is g
+
+    # optional field
+    args = Group([two])
+    ast.replace_child('args', args)
+    assert ast.args is args
+
+    # list field
+    args.replace_child('items', one, 0)
+    assert args.items == [one] and args.get_child('items', 0) is one
+
+
+def test_full_traversal_slots_iter():
+    f, x, one = Identifier('f'), PrototypeIdentifier('x'), make_int(1)
+    args = Group([x, one])
+    root = Call(f, args)
+
+    # the root itself is not yielded, only its descendants with the slot they occupy
+    assert list(root.__full_traversal_slots_iter__()) == [
+        (root, 'f', None, f),
+        (root, 'args', None, args),
+        (args, 'items', 0, x),
+        (args, 'items', 1, one),
+    ]
+
+
+def test_full_traversal_slots_iter_follows_replacements():
+    x = PrototypeIdentifier('x')
+    root = Group([Call(Identifier('f')), x])
+    replacement = Call(Identifier('g'), Group([make_int(1)]))
+
+    seen = []
+    for parent, key, index, child in root.__full_traversal_slots_iter__():
+        seen.append(str(child))
+        if child is x:
+            parent.replace_child(key, replacement, index)
+
+    assert root.items[1] is replacement
+    # traversal continues into the children of the replacement rather than the replaced node
+    assert seen == ['f()', 'f', 'x', 'g', '(1)', '1']
+
+
+def test_post_parse_replaces_the_root():
+    # post_parse wraps the root in a Group so that the root itself occupies a replaceable slot
+    assert post_parse(PrototypeIdentifier('x')) == Express(Identifier('x'))
@@ -1,4 +1,3 @@
-from abc import ABC
 import inspect
 from typing import Callable, Type, Generator
 from types import UnionType
@@ -22,7 +21,13 @@ import pdb
 """
 
 
-class Token(ABC):
+# not an ABC (there are no abstract methods), since isinstance checks against ABCs go through the much slower ABCMeta.__instancecheck__
+class Token:
+    __slots__ = ()
+
+    # bit flags for the operator roles a token can play (see UNARY_PREFIX_OP etc.). Non-operators have none
+    kind = 0
+
     def __repr__(self) -> str:
         """default repr for tokens is just the class name"""
         return f"<{self.__class__.__name__}>"
@@ -48,6 +53,7 @@ class WhiteSpace_t(Token):
 class Operator_t(Token):
     def __init__(self, op: str):
         self.op = op
+        self.kind = operator_kinds.get(op, 0)
 
     def __repr__(self) -> str:
         return f"<Operator_t: `{self.op}`>"
@@ -62,6 +68,7 @@ class Operator_t(Token):
 class Juxtapose_t(Operator_t):
     def __init__(self, _):
         super().__init__('')
+        self.kind = BINARY_OP
 
     def __repr__(self) -> str:
         return f"<Juxtapose_t>"
@@ -167,9 +174,9 @@ class RawString_t(Token):
 
     def to_str(self) -> str:
         body = self.body
-        if body.startswith('r"""') or body.startswith("r'''"):
+        if body.startswith(('r"""', "r'''")):
             body = body[4:-3]
-        elif body.startswith('r"') or body.startswith("r'"):
+        elif body.startswith(('r"', "r'")):
             body = body[2:-1]
         else:
             raise ValueError(f"Internal Error: unrecognized delimiters on raw string: {repr(self)}")
@@ -179,14 +186,15 @@ class RawString_t(Token):
 class String_t(Token):
     def __init__(self, body: list[str | Escape_t | Block_t]):
         self.body = body
+        # positions of interpolation blocks in the body (most strings have none)
+        self.block_indices = tuple(i for i, token in enumerate(body) if isinstance(token, Block_t))
 
     def __repr__(self) -> str:
         return f"<String_t: {self.body}>"
 
     def __iter__(self) -> Generator[list[Token], None, None]:
-        for token in self.body:
-            if isinstance(token, Block_t):
-                yield token.body
+        for i in self.block_indices:
+            yield self.body[i].body
 
 # class Number_t(Token, ABC):...
 
@@ -270,6 +278,7 @@ class Boolean_t(Token):
 class ShiftOperator_t(Operator_t):
     def __init__(self, op: str):
         self.op = op
+        self.kind = BINARY_OP
 
     def __repr__(self) -> str:
         return f"<ShiftOperator_t: `{self.op}`>"
@@ -284,6 +293,7 @@ class ShiftOperator_t(Operator_t):
 class Comma_t(Operator_t):
     def __init__(self, op: str):
         self.op = op
+        self.kind = BINARY_OP
 
     def __hash__(self) -> int:
         return hash(Comma_t)
@@ -336,9 +346,9 @@ valid_delim_closers = {
 
 # list of all operators sorted from longest to shortest
 # TODO: make @ and ... into expressions (perhaps with lower precedence calling than regular calls?)
-unary_prefix_operators = {'+', '-', '*', '/', 'not', '~', '@'}#, '...'}
-unary_postfix_operators = {'?', ';'}
-binary_operators = {
+unary_prefix_operators = frozenset({'+', '-', '*', '/', 'not', '~', '@'})#, '...'})
+unary_postfix_operators = frozenset({'?', ';'})
+binary_operators = frozenset({
     '+', '-', '*', '/', '%', '^',
     '=?', '>?', '<?', '>=?', '<=?', 'in?', 'is?', 'isnt?', '<=>',
     '|', '&',
@@ -349,13 +359,27 @@ binary_operators = {
     '|>', '<|', '=>',
     '->', '<->', #'<-', #reverse arrow is dumb
     '.', ':', ':>'
-}
-opchain_starters = {'+', '-', '*', '/', '%', '^'}
+})
+opchain_starters = frozenset({'+', '-', '*', '/', '%', '^'})
 operators = sorted(
     [*(unary_prefix_operators | unary_postfix_operators | binary_operators)],
     key=len,
     reverse=True
 )
+
+# bit flags for the roles an operator can play. Operator_t.kind holds the combination for its op
+# so classifying an operator token is a single integer AND rather than a string set lookup
+UNARY_PREFIX_OP = 1
+UNARY_POSTFIX_OP = 2
+BINARY_OP = 4
+OPCHAIN_STARTER_OP = 8
+operator_kinds: dict[str, int] = {
+    op: (UNARY_PREFIX_OP if op in unary_prefix_operators else 0)
+      | (UNARY_POSTFIX_OP if op in unary_postfix_operators else 0)
+      | (BINARY_OP if op in binary_operators else 0)
+      | (OPCHAIN_STARTER_OP if op in opchain_starters else 0)
+    for op in operators
+}
 # TODO: may need to separate |> from regular operators since it may confuse type param
 shift_operators = sorted(['<<', '>>', '<<<', '>>>', '<<!', '!>>'], key=len, reverse=True)
 keywords = ['loop', 'lazy', 'do', 'if', 'match', 'return', 'yield', 'break', 'continue',
@@ -1161,10 +1185,20 @@ def validate_block_braces(tokens: list[Token]) -> None:
     Raises:
         AssertionError: if a block is found with an invalid open/close pair
     """
-    for token in traverse_tokens(tokens):
-        if isinstance(token, Block_t):
-            assert token.left in valid_delim_closers, f'INTERNAL ERROR: left block opening token is not a valid token. Expected one of {[*valid_delim_closers.keys()]}. Got \'{token.left}\''
-            assert token.right in valid_delim_closers[token.left], f'ERROR: mismatched opening and closing braces. For opening brace \'{token.left}\', expected one of \'{valid_delim_closers[token.left]}\''
+    # scan directly rather than via traverse_tokens. Bodies of nested tokens are pushed here rather than recursed into
+    stack = [tokens]
+    while stack:
+        for token in stack.pop():
+            token_type = token.__class__
+            if token_type is Block_t:
+                closers = valid_delim_closers.get(token.left)
+                assert closers is not None, f'INTERNAL ERROR: left block opening token is not a valid token. Expected one of {[*valid_delim_closers.keys()]}. Got \'{token.left}\''
+                assert token.right in closers, f'ERROR: mismatched opening and closing braces. For opening brace \'{token.left}\', expected one of \'{closers}\''
+                stack.append(token.body)
+            elif token_type is TypeParam_t:
+                stack.append(token.body)
+            elif token_type is String_t:
+                stack.append([token.body[i] for i in token.block_indices])
 
 
 def validate_functions():